@@ -19,10 +19,146 @@ from gurobipy import GRB
 import time
 import numpy as np
 import argparse
+from functools import lru_cache
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Gurobi environment from a WLS license file, cached per path so
+# repeated CNAlign calls (e.g. a per-patient sweep) reuse one env
+# instead of re-parsing the file and re-connecting every time
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+@lru_cache(maxsize=4)
+def _env_for(license_path):
+    with open(license_path) as file:
+        lines = [line.rstrip() for line in file]
+    params = {
+        "WLSACCESSID": lines[3].split('=')[1],
+        "WLSSECRET": lines[4].split('=')[1],
+        "LICENSEID": int(lines[5].split('=')[1]),
+    }
+    return gb.Env(params=params)
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Coefficients of the n1/mcn equations as functions of (pl, z)
+# All inputs are (n_Samples x n_Segments) ndarrays; where BAF is
+# available (not NaN) the allele-specific form is used, otherwise
+# the total-CN-only form (with mcn fixed to 0)
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def build_coeffs(logR_mat, BAF_mat, GC_mat):
+    c_mat = np.exp2(logR_mat)
+    c1_mat = 2.0*c_mat
+    has_baf = ~np.isnan(BAF_mat)
+    bb = np.where(has_baf, BAF_mat, 0.0)
+    n1_coef_pl = np.where(has_baf, c_mat*(1.0-bb), c_mat)
+    n1_coef_z = np.where(has_baf, c1_mat*(1.0-bb) - GC_mat + 1.0, 2.0*c_mat - GC_mat)
+    n1_const = np.where(has_baf, GC_mat - 1.0 - c1_mat*(1.0-bb), GC_mat - 2.0*c_mat)
+    mcn_coef_pl = np.where(has_baf, bb*c_mat, 0.0)
+    mcn_coef_z = np.where(has_baf, bb*c1_mat - 1.0, 0.0)
+    mcn_const = np.where(has_baf, 1.0 - bb*c1_mat, 0.0)
+    tcn_wt_copies = GC_mat
+    mcn_wt_copies = np.where(has_baf, GC_mat - 1.0, 0.0)
+    return (has_baf, n1_coef_pl, n1_coef_z, n1_const,
+            mcn_coef_pl, mcn_coef_z, mcn_const, tcn_wt_copies, mcn_wt_copies)
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Cheap warm start: per-sample grid search over the (ploidy, 1/purity)
+# box for the point minimizing the summed distance of TCN (and MCN
+# where BAF is available) to their nearest integers. Pure NumPy
+# broadcasting over the grid; no solver involved
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def grid_start(n1_coef_pl, n1_coef_z, n1_const, mcn_coef_pl, mcn_coef_z, mcn_const,
+               has_baf, min_ploidy, max_ploidy, z_min, z_max, n_grid=64):
+    pls = np.linspace(min_ploidy, max_ploidy, n_grid)
+    zs = np.linspace(z_min, z_max, n_grid)
+    n_samples = n1_coef_pl.shape[0]
+    pl0 = np.empty(n_samples)
+    z0 = np.empty(n_samples)
+    for i in range(n_samples):
+        tcn = ((n1_coef_pl[i] + mcn_coef_pl[i])*pls[:, None, None]
+               + (n1_coef_z[i] + mcn_coef_z[i])*zs[None, :, None]
+               + (n1_const[i] + mcn_const[i]))
+        mcn = (mcn_coef_pl[i]*pls[:, None, None]
+               + mcn_coef_z[i]*zs[None, :, None]
+               + mcn_const[i])
+        err = np.abs(tcn - np.round(tcn)).sum(axis=2)
+        err += np.where(has_baf[i], np.abs(mcn - np.round(mcn)), 0.0).sum(axis=2)
+        # negative copy numbers can never be part of a feasible solution,
+        # so push the start away from them
+        err += 10.0*np.clip(-tcn, 0.0, None).sum(axis=2)
+        err += 10.0*np.clip(-mcn, 0.0, None).sum(axis=2)
+        k = np.argmin(err)
+        pl0[i], z0[i] = pls[k // n_grid], zs[k % n_grid]
+    return pl0, z0
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Shared constraint block for one allele-level quantity (TCN or MCN):
+# closeness to its nearest integer, to the per-segment average, and of
+# the average to its integer, plus the match/gain/loss/cna bookkeeping
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+def add_cn_block(model, idx, x, x_avg, x_int, x_int_err, x_spread,
+                 x_avg_int, x_avg_int_err, close_to_int, close_to_avg,
+                 avg_close_to_int, match, match_and_avg_at_int, gain, loss, cna,
+                 x_ub, wt_copies, delta_int, delta_avg, delta_avg_int):
+    n_samples = x.shape[0]
+
+    # is X close to its nearest integer (explicit big-M form of the
+    # indicator, with a tight M: the int err cannot exceed 0.5)
+    M_int = max(0.5, delta_int)
+    model.addConstr(x_int <= x + 0.5)
+    model.addConstr(x_int >= x - 0.5)
+    model.addConstr(x_int_err >= x_int - x)
+    model.addConstr(x_int_err >= -x_int + x)
+    model.addConstr(x_int_err <= delta_int + (M_int - delta_int)*(1 - close_to_int))
+
+    # is X close to the per-segment average (not too spread out); the spread
+    # is bounded per segment by the largest upper bound among samples
+    M_spread = np.maximum(x_ub.max(axis=0), delta_avg) + 1.0
+    model.addConstr(x_avg == x.sum(axis=0)/n_samples)
+    model.addConstr(x_spread >= x_avg - x)
+    model.addConstr(x_spread >= -x_avg + x)
+    model.addConstr(x_spread <= delta_avg + (M_spread - delta_avg)*(1 - close_to_avg))
+
+    # is the per-segment average close to its nearest integer
+    M_avg_int = max(0.5, delta_avg_int)
+    model.addConstr(x_avg_int <= x_avg + 0.5)
+    model.addConstr(x_avg_int >= x_avg - 0.5)
+    model.addConstr(x_avg_int_err >= x_avg - x_avg_int)
+    model.addConstr(x_avg_int_err >= -x_avg + x_avg_int)
+    model.addConstr(x_avg_int_err <= delta_avg_int + (M_avg_int - delta_avg_int)*(1 - avg_close_to_int))
+
+    ## plain Var views for the scalar indicator-constraint API
+    x_int_v = x_int.tolist()
+    gain_v = gain.tolist()
+    loss_v = loss.tolist()
+
+    ## constraint for X-based CNA
+    model.addConstrs(((gain_v[i][j]==1) >> (x_int_v[i][j] >= wt_copies[i,j] + 1) for i,t,j,s in idx))
+    model.addConstrs(((loss_v[i][j]==1) >> (x_int_v[i][j] <= wt_copies[i,j] - 1) for i,t,j,s in idx))
+    # cna = gain OR loss, in direct linear form
+    model.addConstr(cna >= gain)
+    model.addConstr(cna >= loss)
+    model.addConstr(cna <= gain + loss)
+
+    ## match if both close enough and same int as the rounded average (binary
+    ## ANDs in direct linear form, vectorized over all cells; the per-segment
+    ## avg_close_to_int broadcasts across samples)
+    model.addConstr(match <= close_to_int)
+    model.addConstr(match <= close_to_avg)
+    model.addConstr(match >= close_to_int + close_to_avg - 1)
+    model.addConstr(match_and_avg_at_int <= match)
+    model.addConstr(match_and_avg_at_int <= avg_close_to_int)
+    model.addConstr(match_and_avg_at_int >= match + avg_close_to_int - 1)
+
 
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # Main CNAlign algorithm using gurobipy
-# input dat should be a pandas data.frame with columns: 
+# input dat should be a pandas data.frame with columns:
 # "sample", "segment", "logR", "BAF", "GC", "mb"
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
@@ -32,20 +168,10 @@ def CNAlign(dat, gurobi_license, min_ploidy, max_ploidy, min_purity, max_purity,
                delta_mcn_to_int, delta_mcn_to_avg, delta_mcnavg_to_int, 
                mcn_weight, rho, timeout, min_cna_segments_per_sample, obj2_clonalonly, sol_count):
 
-    # Create an environment with your WLS license
-    with open(gurobi_license) as file:
-        lines = [line.rstrip() for line in file]
-
-    params = {
-        "WLSACCESSID": lines[3].split('=')[1],
-        "WLSSECRET": lines[4].split('=')[1],
-        "LICENSEID": int(lines[5].split('=')[1]),
-    }
-
     class StagnationCallback:
-        def __init__(self, max_stagnation_seconds):
+        def __init__(self, max_stagnation_seconds, label):
             self.max_stagnation = max_stagnation_seconds
-            self.obj_count = 0
+            self.label = label
             self.last_improve_time = time.time()
             self.best_obj = float('inf')
             self.stagnated = False
@@ -53,15 +179,7 @@ def CNAlign(dat, gurobi_license, min_ploidy, max_ploidy, min_purity, max_purity,
         def __call__(self, model, where):
             now = time.time()
 
-            if where == GRB.Callback.MULTIOBJ:
-                # Starting a new multi-objective level
-                self.obj_count = model.cbGet(GRB.Callback.MULTIOBJ_OBJCNT)
-                self.best_obj = float('inf')
-                self.last_improve_time = now
-                self.stagnated = False
-                print(f"[Callback] Starting objective {self.obj_count}")
-
-            elif where == GRB.Callback.MIP:
+            if where == GRB.Callback.MIP:
                 try:
                     current_obj = model.cbGet(GRB.Callback.MIP_OBJBST)
                     if current_obj < GRB.INFINITY:
@@ -69,14 +187,11 @@ def CNAlign(dat, gurobi_license, min_ploidy, max_ploidy, min_purity, max_purity,
                             self.best_obj = current_obj
                             self.last_improve_time = now
                         elif now - self.last_improve_time > self.max_stagnation and not self.stagnated:
-                            print(f"[Callback] No improvement for {self.max_stagnation}s on objective {self.obj_count}. Moving to next.")
+                            print(f"[Callback] No improvement for {self.max_stagnation}s on {self.label}. Stopping this solve.")
                             self.stagnated = True
-                            model.cbStopOneMultiObj(self.obj_count)
+                            model.terminate()
                 except Exception as e:
-                    print(f"[Callback] Exception in MIP callback: {e}") 
-
-    # create custom callback
-    callback = StagnationCallback(max_stagnation_seconds=timeout)
+                    print(f"[Callback] Exception in MIP callback: {e}")
 
     # Read input data into pandas DataFrame
     Samples = dat['sample'].unique()
@@ -88,8 +203,14 @@ def CNAlign(dat, gurobi_license, min_ploidy, max_ploidy, min_purity, max_purity,
     dat = dat.reset_index()
     dat.set_index(['sample','segment'], inplace=True)
     
-    # recode NaN BAFs to -9
-    dat.loc[np.isnan(dat['BAF']),'BAF'] = -9
+    # materialize the per-(sample,segment) data as 2-D NumPy arrays (samples x segments)
+    # so the constraint-building loop below can index by integer instead of pandas .loc
+    arrs = {col: dat[col].unstack('segment').reindex(index=Samples, columns=Segments).to_numpy()
+            for col in ['logR','BAF','GC','mb']}
+    logR_mat = arrs['logR']
+    BAF_mat = arrs['BAF']
+    GC_mat = arrs['GC']
+    mb_mat = arrs['mb']
 
     # print out message with input parameters 
     print('\n-------------------------------------')
@@ -110,197 +231,189 @@ def CNAlign(dat, gurobi_license, min_ploidy, max_ploidy, min_purity, max_purity,
     print('- # segments in data: '+str(n_Segments))
     print('-------------------------------------')
 
-    env = gb.Env(params=params) 
+    env = _env_for(gurobi_license)
     model = gb.Model(env=env)
     model.setParam(GRB.Param.PoolSolutions, sol_count)
 
-    n1 = model.addVars(Samples, Segments, vtype=GRB.CONTINUOUS, name='n1') 
-    tcn = model.addVars(Samples, Segments, vtype=GRB.CONTINUOUS, name='tcn')    
-    tcn_avg = model.addVars(Samples, Segments, vtype=GRB.CONTINUOUS, name='tcn_avg')
-    tcn_int = model.addVars(Samples, Segments, vtype=GRB.INTEGER, name='tcn_int')
-    tcn_int_err = model.addVars(Samples, Segments, vtype=GRB.CONTINUOUS, name='tcn_int_err', lb=0)
-    tcn_spread = model.addVars(Samples, Segments, vtype=GRB.CONTINUOUS, name='tcn_spread', lb=0)
-    tcn_avg_int = model.addVars(Samples, Segments, vtype=GRB.INTEGER, name='tcn_avg_int', lb=0)
-    tcn_avg_int_err = model.addVars(Samples, Segments, vtype=GRB.CONTINUOUS, name='tcn_avg_int_err', lb=0)
-
-    tcn_close_to_int = model.addVars(Samples, Segments, vtype=GRB.BINARY, name='tcn_close_to_int')
-    tcn_close_to_avg = model.addVars(Samples, Segments, vtype=GRB.BINARY, name='tcn_close_to_avg')
-    tcn_avg_close_to_int = model.addVars(Samples, Segments, vtype=GRB.BINARY, name='tcn_avg_close_to_int')
-    tcn_match = model.addVars(Samples, Segments, vtype=GRB.BINARY, name='tcn_match')
-    tcn_match_and_avg_at_int = model.addVars(Samples, Segments, vtype=GRB.BINARY, name='tcn_match_and_avg_at_int')
-    tcn_gain = model.addVars(Samples, Segments, vtype=GRB.BINARY, name='tcn_gain')
-    tcn_loss = model.addVars(Samples, Segments, vtype=GRB.BINARY, name='tcn_loss')
-    tcn_cna = model.addVars(Samples, Segments, vtype=GRB.BINARY, name='tcn_cna')
+    # solver settings tuned for this class of MIP: heavy symmetry (samples are
+    # interchangeable), many indicator constraints, and a feasibility-driven
+    # first objective
+    model.setParam('Symmetry', 2)
+    model.setParam('MIPFocus', 1)
+    model.setParam('Heuristics', 0.5)
+    model.setParam('Cuts', 2)
+    model.setParam('PreSparsify', 1)
+    model.setParam('NumericFocus', 2)
+    if n_Segments*n_Samples > 50000:
+        # very large instances: spend up to a minute in the no-relaxation
+        # heuristic before the root relaxation
+        model.setParam('NoRelHeurTime', 60)
+
+    ## data-derived coefficients for the n1/mcn equations, plus the numbers of
+    ## WT copies that TCN/MCN are compared against for gains/losses
+    (has_baf, n1_coef_pl, n1_coef_z, n1_const,
+     mcn_coef_pl, mcn_coef_z, mcn_const,
+     tcn_wt_copies, mcn_wt_copies) = build_coeffs(logR_mat, BAF_mat, GC_mat)
+
+    ## a priori upper bounds implied by the ploidy/purity box: each CN
+    ## quantity is linear in (pl, z) so its extremes sit at the box corners
+    z_min, z_max = 1/max_purity, 1/min_purity
+    def corner_ub(coef_pl, coef_z, const):
+        return (const + np.maximum(coef_pl*min_ploidy, coef_pl*max_ploidy)
+                      + np.maximum(coef_z*z_min, coef_z*z_max) + 1e-6)
+    n1_ub = np.maximum(corner_ub(n1_coef_pl, n1_coef_z, n1_const), 0.0)
+    mcn_ub = np.maximum(corner_ub(mcn_coef_pl, mcn_coef_z, mcn_const), 0.0)
+    tcn_ub = np.maximum(corner_ub(n1_coef_pl + mcn_coef_pl, n1_coef_z + mcn_coef_z,
+                                  n1_const + mcn_const), 0.0)
+
+    ## cells with no BAF have mcn fixed to 0, so their integer copy number and
+    ## gain/loss/cna binaries are forced too; fix them through their bounds so
+    ## presolve drops them instead of branching on them
+    baf_mask = has_baf.astype(float)
+
+    # all (sample,segment)-level variable families are (n_Samples x n_Segments)
+    # MVar ndarrays indexed by integer position, not label-keyed tupledicts
+    shape = (n_Samples, n_Segments)
+
+    n1 = model.addMVar(shape, vtype=GRB.CONTINUOUS, name='n1', ub=n1_ub)
+    tcn = model.addMVar(shape, vtype=GRB.CONTINUOUS, name='tcn', ub=tcn_ub)
+    tcn_avg = model.addMVar(n_Segments, vtype=GRB.CONTINUOUS, name='tcn_avg')
+    tcn_int = model.addMVar(shape, vtype=GRB.INTEGER, name='tcn_int', ub=np.ceil(tcn_ub)+1)
+    tcn_int_err = model.addMVar(shape, vtype=GRB.CONTINUOUS, name='tcn_int_err', lb=0)
+    tcn_spread = model.addMVar(shape, vtype=GRB.CONTINUOUS, name='tcn_spread', lb=0)
+    tcn_avg_int = model.addMVar(n_Segments, vtype=GRB.INTEGER, name='tcn_avg_int', lb=0)
+    tcn_avg_int_err = model.addMVar(n_Segments, vtype=GRB.CONTINUOUS, name='tcn_avg_int_err', lb=0)
+
+    tcn_close_to_int = model.addMVar(shape, vtype=GRB.BINARY, name='tcn_close_to_int')
+    tcn_close_to_avg = model.addMVar(shape, vtype=GRB.BINARY, name='tcn_close_to_avg')
+    tcn_avg_close_to_int = model.addMVar(n_Segments, vtype=GRB.BINARY, name='tcn_avg_close_to_int')
+    tcn_match = model.addMVar(shape, vtype=GRB.BINARY, name='tcn_match')
+    tcn_match_and_avg_at_int = model.addMVar(shape, vtype=GRB.BINARY, name='tcn_match_and_avg_at_int')
+    tcn_gain = model.addMVar(shape, vtype=GRB.BINARY, name='tcn_gain')
+    tcn_loss = model.addMVar(shape, vtype=GRB.BINARY, name='tcn_loss')
+    tcn_cna = model.addMVar(shape, vtype=GRB.BINARY, name='tcn_cna')
     tcn_error_clonal = model.addVar(vtype=GRB.CONTINUOUS, lb=0, name='tcn_error_clonal')
 
-    mcn = model.addVars(Samples, Segments, vtype=GRB.CONTINUOUS, name='mcn')    
-    mcn_avg = model.addVars(Samples, Segments, vtype=GRB.CONTINUOUS, name='mcn_avg')
-    mcn_int = model.addVars(Samples, Segments, vtype=GRB.INTEGER, name='mcn_int')
-    mcn_int_err = model.addVars(Samples, Segments, vtype=GRB.CONTINUOUS, name='mcn_int_err', lb=0)
-    mcn_spread = model.addVars(Samples, Segments, vtype=GRB.CONTINUOUS, name='mcn_spread', lb=0)
-    mcn_avg_int = model.addVars(Samples, Segments, vtype=GRB.INTEGER, name='mcn_avg_int', lb=0)
-    mcn_avg_int_err = model.addVars(Samples, Segments, vtype=GRB.CONTINUOUS, name='mcn_avg_int_err', lb=0)
-
-    mcn_close_to_int = model.addVars(Samples, Segments, vtype=GRB.BINARY, name='mcn_close_to_int')
-    mcn_close_to_avg = model.addVars(Samples, Segments, vtype=GRB.BINARY, name='mcn_close_to_avg')
-    mcn_avg_close_to_int = model.addVars(Samples, Segments, vtype=GRB.BINARY, name='mcn_avg_close_to_int')
-    mcn_match = model.addVars(Samples, Segments, vtype=GRB.BINARY, name='mcn_match')    
-    mcn_match_and_avg_at_int = model.addVars(Samples, Segments, vtype=GRB.BINARY, name='mcn_match_and_avg_at_int')
-    mcn_gain = model.addVars(Samples, Segments, vtype=GRB.BINARY, name='mcn_gain')
-    mcn_loss = model.addVars(Samples, Segments, vtype=GRB.BINARY, name='mcn_loss')
-    mcn_cna = model.addVars(Samples, Segments, vtype=GRB.BINARY, name='mcn_cna')
+    mcn = model.addMVar(shape, vtype=GRB.CONTINUOUS, name='mcn', ub=mcn_ub)
+    mcn_avg = model.addMVar(n_Segments, vtype=GRB.CONTINUOUS, name='mcn_avg')
+    mcn_int = model.addMVar(shape, vtype=GRB.INTEGER, name='mcn_int', ub=np.where(has_baf, np.ceil(mcn_ub)+1, 0.0))
+    mcn_int_err = model.addMVar(shape, vtype=GRB.CONTINUOUS, name='mcn_int_err', lb=0, ub=np.where(has_baf, GRB.INFINITY, 0.0))
+    mcn_spread = model.addMVar(shape, vtype=GRB.CONTINUOUS, name='mcn_spread', lb=0)
+    mcn_avg_int = model.addMVar(n_Segments, vtype=GRB.INTEGER, name='mcn_avg_int', lb=0)
+    mcn_avg_int_err = model.addMVar(n_Segments, vtype=GRB.CONTINUOUS, name='mcn_avg_int_err', lb=0)
+
+    mcn_close_to_int = model.addMVar(shape, vtype=GRB.BINARY, name='mcn_close_to_int')
+    mcn_close_to_avg = model.addMVar(shape, vtype=GRB.BINARY, name='mcn_close_to_avg')
+    mcn_avg_close_to_int = model.addMVar(n_Segments, vtype=GRB.BINARY, name='mcn_avg_close_to_int')
+    mcn_match = model.addMVar(shape, vtype=GRB.BINARY, name='mcn_match')
+    mcn_match_and_avg_at_int = model.addMVar(shape, vtype=GRB.BINARY, name='mcn_match_and_avg_at_int')
+    mcn_gain = model.addMVar(shape, vtype=GRB.BINARY, name='mcn_gain', ub=baf_mask)
+    mcn_loss = model.addMVar(shape, vtype=GRB.BINARY, name='mcn_loss', ub=baf_mask)
+    mcn_cna = model.addMVar(shape, vtype=GRB.BINARY, name='mcn_cna', ub=baf_mask)
     mcn_error_clonal = model.addVar(vtype=GRB.CONTINUOUS, lb=0, name='mcn_error_clonal')
-    
-    
+
+
     # additional Sample+Segment-level variables
-    match_both = model.addVars(Samples, Segments, vtype=GRB.BINARY, name='match_both')
-    match_both_and_large_enough = model.addVars(Samples, Segments, vtype=GRB.BINARY, name='match_both_and_large_enough')        
-    match_both_and_large_enough_and_cna = model.addVars(Samples, Segments, vtype=GRB.BINARY, name='match_both_and_large_enough_and_cna')        
-    is_homdel = model.addVars(Samples, Segments, vtype=GRB.BINARY, name='is_homdel')
-    is_cna = model.addVars(Samples, Segments, vtype=GRB.BINARY, name='is_cna')
-    large_enough = model.addVars(Samples, Segments, vtype=GRB.BINARY, name='large_enough')
-    
+    match_both = model.addMVar(shape, vtype=GRB.BINARY, name='match_both')
+    match_both_and_large_enough = model.addMVar(shape, vtype=GRB.BINARY, name='match_both_and_large_enough')
+    match_both_and_large_enough_and_cna = model.addMVar(shape, vtype=GRB.BINARY, name='match_both_and_large_enough_and_cna')
+    is_homdel = model.addMVar(shape, vtype=GRB.BINARY, name='is_homdel')
+    is_cna = model.addMVar(shape, vtype=GRB.BINARY, name='is_cna')
+    large_enough = model.addMVar(shape, vtype=GRB.BINARY, name='large_enough')
+
     # additional Segment-level variables
-    allmatch = model.addVars(Segments, vtype=GRB.BINARY, name='allmatch')
-    
+    allmatch = model.addMVar(n_Segments, vtype=GRB.BINARY, name='allmatch')
+
     # additional Sample-level variables
-    pl = model.addVars(Samples, vtype=GRB.CONTINUOUS, name='pl', lb=min_ploidy, ub=max_ploidy)
-    z = model.addVars(Samples, vtype=GRB.CONTINUOUS, name='z', lb=1/max_purity, ub=1/min_purity)
-    homdel_mb = model.addVars(Samples, vtype=GRB.CONTINUOUS, name='homdel_mb', lb=0, ub=max_homdel_mb)
-    n_cna_segments_per_sample = model.addVars(Samples, vtype=GRB.INTEGER, name='n_cna_segments_per_sample', lb=min_cna_segments_per_sample, ub=n_Segments)
+    pl = model.addMVar(n_Samples, vtype=GRB.CONTINUOUS, name='pl', lb=min_ploidy, ub=max_ploidy)
+    z = model.addMVar(n_Samples, vtype=GRB.CONTINUOUS, name='z', lb=1/max_purity, ub=1/min_purity)
+    homdel_mb = model.addMVar(n_Samples, vtype=GRB.CONTINUOUS, name='homdel_mb', lb=0, ub=max_homdel_mb)
+    n_cna_segments_per_sample = model.addMVar(n_Samples, vtype=GRB.INTEGER, name='n_cna_segments_per_sample', lb=min_cna_segments_per_sample, ub=n_Segments)
 
     # variable for the average ploidy
     avg_ploidy = model.addVar(vtype=GRB.CONTINUOUS, name='avg_ploidy', lb=min_ploidy, ub=max_ploidy) # the average ploidy across all samples
         
     ## the number of WT copies should be round(avg_ploidy/2)
-    model.addConstr(avg_ploidy == gb.quicksum(pl[t] for t in Samples)/n_Samples, name='c_pl_avg')
+    model.addConstr(avg_ploidy == pl.sum()/n_Samples, name='c_pl_avg')
 
     # objective variables
     n_clonal = model.addVar(vtype=GRB.INTEGER, lb=0, ub=n_Segments, name='n_clonal')
 
 
-    ## segment,sample-level contraints
-    for s in Segments:
-        for t in Samples:
-            ## calculate values
-            r = dat.loc[t,s].logR
-            b = dat.loc[t,s].BAF
-            g = dat.loc[t,s].GC # germline copies
-            c = 2**r
-            c1 = 2**(r+1)
-
-            ## check if segment is large enough
-            l = dat.loc[t,s].mb
-            model.addGenConstrIndicator(large_enough[(t, s)], 1, l, GRB.GREATER_EQUAL, min_aligned_seg_mb, name='c_large_enough_'+str(t)+','+str(s))
-
-            if b!=-9:
-                ## logR+BAF are available so get n1 and n2
-                model.addConstr(n1[t, s] == -b*c*pl[t] + b*c1 - b*c1*z[t] + c*pl[t] - c1 + c1*z[t] + g - g*z[t] - 1 + z[t])
-                model.addConstr(mcn[t, s] == b*c*pl[t] - b*c1 + b*c1*z[t] + 1 - z[t])
-                tcn_wt_copies = g
-                mcn_wt_copies = g-1
-            else:
-                # only logR is available, so get total CN {n1, NA} s.t. n1=total number of copies
-                model.addConstr(n1[(t, s)] == z[t]*c*2 + c*pl[t] - 2*c - g*z[t] + g, name='c_n1_'+str(t)+','+str(s))
-                model.addConstr(mcn[(t, s)] == 0, name='c_n2_'+str(t)+','+str(s))
-                tcn_wt_copies = g
-                mcn_wt_copies = 0
-
-            model.addConstr(tcn[t, s] == n1[t,s] + mcn[t,s])
-            
-            # =============================================================================
-            # TCN
-            # =============================================================================
-            
-            # is TCN close to its nearest integer
-            model.addConstr(tcn_int[t,s] <= tcn[t,s] + 0.5) 
-            model.addConstr(tcn_int[t,s] >= tcn[t,s] - 0.5) 
-            model.addConstr(tcn_int_err[t,s] >= tcn_int[t,s] - tcn[t,s])
-            model.addConstr(tcn_int_err[t,s] >= -tcn_int[t,s] + tcn[t,s])
-            model.addGenConstrIndicator(tcn_close_to_int[t,s], 1, tcn_int_err[t,s], GRB.LESS_EQUAL, delta_tcn_to_int)
-            
-            # is TCN close to the TCNavg (not too spread out)
-            model.addConstr(tcn_avg[t,s] == gb.quicksum(tcn[t,s] for t in Samples)/n_Samples)
-            model.addConstr(tcn_spread[t,s] >= tcn_avg[t,s] - tcn[t,s])
-            model.addConstr(tcn_spread[t,s] >= -tcn_avg[t,s] + tcn[t,s])     
-            model.addGenConstrIndicator(tcn_close_to_avg[t,s], 1, tcn_spread[t,s], GRB.LESS_EQUAL, delta_tcn_to_avg)
-            
-            # is TCNavg close to its nearest integer
-            model.addConstr(tcn_avg_int[t,s] <= tcn_avg[t,s] + 0.5) 
-            model.addConstr(tcn_avg_int[t,s] >= tcn_avg[t,s] - 0.5) 
-            model.addConstr(tcn_avg_int_err[t,s] >= tcn_avg[t,s] - tcn_avg_int[t,s])
-            model.addConstr(tcn_avg_int_err[t,s] >= -tcn_avg[t,s] + tcn_avg_int[t,s])                
-            model.addGenConstrIndicator(tcn_avg_close_to_int[t,s], 1, tcn_avg_int_err[t,s], GRB.LESS_EQUAL, delta_tcnavg_to_int)
-            
-            ## match if both close enough and same int as the rounded average
-            model.addGenConstrAnd(tcn_match[t,s], [tcn_close_to_int[t,s], tcn_close_to_avg[t,s]]) 
-            model.addGenConstrAnd(tcn_match_and_avg_at_int[t,s], [tcn_match[t,s], tcn_avg_close_to_int[t,s]]) 
-
-            ## constraint for TCN-based CNA
-            model.addConstr((tcn_gain[t,s]==1) >> (tcn_int[t,s] >= tcn_wt_copies + 1))
-            model.addConstr((tcn_loss[t,s]==1) >> (tcn_int[t,s] <= tcn_wt_copies - 1))
-            model.addGenConstrOr(tcn_cna[t,s], [tcn_gain[t,s], tcn_loss[t,s]])
-
-
-            # =============================================================================
-            # MCN
-            # =============================================================================
-
-            # is MCN close to its nearest integer
-            model.addConstr(mcn_int[t,s] <= mcn[t,s] + 0.5) 
-            model.addConstr(mcn_int[t,s] >= mcn[t,s] - 0.5) 
-            model.addConstr(mcn_int_err[t,s] >= mcn_int[t,s] - mcn[t,s])
-            model.addConstr(mcn_int_err[t,s] >= -mcn_int[t,s] + mcn[t,s])
-            model.addGenConstrIndicator(mcn_close_to_int[t,s], 1, mcn_int_err[t,s], GRB.LESS_EQUAL, delta_mcn_to_int)
-            
-            # is MCN close to the MCNavg (not too spread out)
-            model.addConstr(mcn_avg[t,s] == gb.quicksum(mcn[t,s] for t in Samples)/n_Samples)
-            model.addConstr(mcn_spread[t,s] >= mcn_avg[t,s] - mcn[t,s])
-            model.addConstr(mcn_spread[t,s] >= -mcn_avg[t,s] + mcn[t,s])     
-            model.addGenConstrIndicator(mcn_close_to_avg[t,s], 1, mcn_spread[t,s], GRB.LESS_EQUAL, delta_mcn_to_avg)
-            
-            # is MCNavg close to its nearest integer
-            model.addConstr(mcn_avg_int[t,s] <= mcn_avg[t,s] + 0.5) 
-            model.addConstr(mcn_avg_int[t,s] >= mcn_avg[t,s] - 0.5) 
-            model.addConstr(mcn_avg_int_err[t,s] >= mcn_avg[t,s] - mcn_avg_int[t,s])
-            model.addConstr(mcn_avg_int_err[t,s] >= -mcn_avg[t,s] + mcn_avg_int[t,s])                
-            model.addGenConstrIndicator(mcn_avg_close_to_int[t,s], 1, mcn_avg_int_err[t,s], GRB.LESS_EQUAL, delta_mcnavg_to_int)
-            
-            ## match if both close enough and same int as the rounded average
-            model.addGenConstrAnd(mcn_match[t,s], [mcn_close_to_int[t,s], mcn_close_to_avg[t,s]]) 
-            model.addGenConstrAnd(mcn_match_and_avg_at_int[t,s], [mcn_match[t,s], mcn_avg_close_to_int[t,s]]) 
-
-            ## constraint for TCN-based CNA
-            model.addConstr((mcn_gain[t,s]==1) >> (mcn_int[t,s] >= mcn_wt_copies + 1))
-            model.addConstr((mcn_loss[t,s]==1) >> (mcn_int[t,s] <= mcn_wt_copies - 1))
-            model.addGenConstrOr(mcn_cna[t,s], [mcn_gain[t,s], mcn_loss[t,s]])
-
-
-
-            # =============================================================================
-            # combined TCN and MCN
-            # =============================================================================
-       
-            ## check for both TCN and MCN match
-            model.addGenConstrAnd(match_both[t,s], [tcn_match_and_avg_at_int[t,s], mcn_match_and_avg_at_int[t,s]]) 
-                
-            ## check for CNA in TCN or MCN
-            model.addGenConstrOr(is_cna[t,s], [tcn_cna[t,s], mcn_cna[t,s]]) 
-                
-            ## check if it has homdel
-            model.addGenConstrIndicator(is_homdel[t,s], 1, tcn[t,s], GRB.LESS_EQUAL, 0.5)
-            
-            ## check if segment matches and is large and has a CNA 
-            model.addGenConstrAnd(match_both_and_large_enough[t,s], [match_both[t,s], large_enough[t,s]])
-            model.addGenConstrAnd(match_both_and_large_enough_and_cna[t,s], [match_both_and_large_enough[t,s], is_cna[t,s]])
-
-    for s in Segments:    
-        model.addGenConstrIndicator(allmatch[s], 1, gb.quicksum(match_both_and_large_enough_and_cna[(t, s)] for t in Samples), GRB.GREATER_EQUAL, rho*n_Samples)
+    ## integer positions alongside the (sample,segment) labels
+    idx = [(i, t, j, s) for i, t in enumerate(Samples) for j, s in enumerate(Segments)]
+
+    ## plain Var views of the MVar families, for the scalar general-constraint
+    ## API (indicator/and/or take Var objects, not 0-d MVars)
+    tcn_v = tcn.tolist()
+    match_both_and_large_enough_and_cna_v = match_both_and_large_enough_and_cna.tolist()
+    is_homdel_v = is_homdel.tolist()
+    large_enough_v = large_enough.tolist()
+    allmatch_v = allmatch.tolist()
+
+    ## broadcast helpers: per-sample variables as column vectors
+    pl_col = pl.reshape((n_Samples, 1))
+    z_col = z.reshape((n_Samples, 1))
+
+    ## segment,sample-level contraints: one matrix constraint per family
+    model.addConstr(n1 == n1_coef_pl*pl_col + n1_coef_z*z_col + n1_const, name='c_n1')
+    model.addConstr(mcn == mcn_coef_pl*pl_col + mcn_coef_z*z_col + mcn_const, name='c_n2')
+    model.addConstr(tcn == n1 + mcn, name='c_tcn')
+
+    # =============================================================================
+    # TCN
+    # =============================================================================
+    add_cn_block(model, idx, tcn, tcn_avg, tcn_int, tcn_int_err, tcn_spread,
+                 tcn_avg_int, tcn_avg_int_err, tcn_close_to_int, tcn_close_to_avg,
+                 tcn_avg_close_to_int, tcn_match, tcn_match_and_avg_at_int,
+                 tcn_gain, tcn_loss, tcn_cna, tcn_ub, tcn_wt_copies,
+                 delta_tcn_to_int, delta_tcn_to_avg, delta_tcnavg_to_int)
+
+    # =============================================================================
+    # MCN
+    # =============================================================================
+    add_cn_block(model, idx, mcn, mcn_avg, mcn_int, mcn_int_err, mcn_spread,
+                 mcn_avg_int, mcn_avg_int_err, mcn_close_to_int, mcn_close_to_avg,
+                 mcn_avg_close_to_int, mcn_match, mcn_match_and_avg_at_int,
+                 mcn_gain, mcn_loss, mcn_cna, mcn_ub, mcn_wt_copies,
+                 delta_mcn_to_int, delta_mcn_to_avg, delta_mcnavg_to_int)
+
+    # =============================================================================
+    # combined TCN and MCN
+    # =============================================================================
+
+    ## check for both TCN and MCN match (binary AND in direct linear form)
+    model.addConstr(match_both <= tcn_match_and_avg_at_int)
+    model.addConstr(match_both <= mcn_match_and_avg_at_int)
+    model.addConstr(match_both >= tcn_match_and_avg_at_int + mcn_match_and_avg_at_int - 1)
+
+    ## check for CNA in TCN or MCN (binary OR in direct linear form)
+    model.addConstr(is_cna >= tcn_cna)
+    model.addConstr(is_cna >= mcn_cna)
+    model.addConstr(is_cna <= tcn_cna + mcn_cna)
+
+    ## check if segment matches and is large and has a CNA
+    model.addConstr(match_both_and_large_enough <= match_both)
+    model.addConstr(match_both_and_large_enough <= large_enough)
+    model.addConstr(match_both_and_large_enough >= match_both + large_enough - 1)
+    model.addConstr(match_both_and_large_enough_and_cna <= match_both_and_large_enough)
+    model.addConstr(match_both_and_large_enough_and_cna <= is_cna)
+    model.addConstr(match_both_and_large_enough_and_cna >= match_both_and_large_enough + is_cna - 1)
+
+    ## indicator constraints have no linear equivalent, keep them per-cell
+    for i, t, j, s in idx:
+        ## check if segment is large enough
+        model.addGenConstrIndicator(large_enough_v[i][j], 1, mb_mat[i,j], GRB.GREATER_EQUAL, min_aligned_seg_mb, name='c_large_enough_'+str(t)+','+str(s))
+
+        ## check if it has homdel
+        model.addGenConstrIndicator(is_homdel_v[i][j], 1, tcn_v[i][j], GRB.LESS_EQUAL, 0.5)
+
+    for j, s in enumerate(Segments):
+        model.addGenConstrIndicator(allmatch_v[j], 1, gb.quicksum(match_both_and_large_enough_and_cna_v[i][j] for i in range(n_Samples)), GRB.GREATER_EQUAL, rho*n_Samples)
 
     # get total homdel Mb and number of segments with CNAs for each sample
-    for t in Samples:
-        model.addConstr(homdel_mb[t] == gb.quicksum(dat.loc[(t,s)].mb * is_homdel[(t, s)] for s in Segments))
-        model.addConstr(n_cna_segments_per_sample[t] == gb.quicksum(is_cna[(t,s)] for s in Segments))
+    model.addConstr(homdel_mb == (mb_mat * is_homdel).sum(axis=1))
+    model.addConstr(n_cna_segments_per_sample == is_cna.sum(axis=1))
 
 
     # =============================================================================
@@ -308,39 +421,66 @@ def CNAlign(dat, gurobi_license, min_ploidy, max_ploidy, min_purity, max_purity,
     # =============================================================================
 
     # objective 1: number of segments with clonal SCNAs (the same CNA in 1+ allele, present in rho+ % of samples)
-    model.addConstr(n_clonal == gb.quicksum(allmatch[s] for s in Segments))
-    
+    model.addConstr(n_clonal == allmatch.sum())
+
     if(obj2_clonalonly==False):
         # objective 2a, 2b: minimize the combined error among all segments
-        model.addConstr(tcn_error_clonal == gb.quicksum(tcn_int_err[t, s] for t in Samples for s in Segments))
-        model.addConstr(mcn_error_clonal == gb.quicksum(mcn_int_err[t, s] for t in Samples for s in Segments))    
-    
-    else:
-        # objective 2a, 2b: minimize the combined error among CLONAL segments 
-        tcn_int_err_term = model.addVars(Samples, Segments, vtype=GRB.CONTINUOUS, name="tcn_int_err_term")
-        mcn_int_err_term = model.addVars(Samples, Segments, vtype=GRB.CONTINUOUS, name="mcn_int_err_term")
-        for t in Samples:
-            for s in Segments:
-                model.addConstr(tcn_int_err_term[t, s] <= tcn_int_err[t, s])
-                model.addConstr(tcn_int_err_term[t, s] <= allmatch[s])
-                model.addConstr(tcn_int_err_term[t, s] >= tcn_int_err[t, s] - (1 - allmatch[s]))
-                model.addConstr(tcn_int_err_term[t, s] >= 0)    
-                model.addConstr(mcn_int_err_term[t, s] <= mcn_int_err[t, s])
-                model.addConstr(mcn_int_err_term[t, s] <= allmatch[s])
-                model.addConstr(mcn_int_err_term[t, s] >= mcn_int_err[t, s] - (1 - allmatch[s]))
-                model.addConstr(mcn_int_err_term[t, s] >= 0)              
-        model.addConstr(tcn_error_clonal == gb.quicksum(tcn_int_err_term[t, s] for t in Samples for s in Segments))
-        model.addConstr(mcn_error_clonal == gb.quicksum(mcn_int_err_term[t, s] for t in Samples for s in Segments))
-
-    # Optimize with stagnation callback  
-    model.setObjectiveN(n_clonal, index=0, priority=2, weight=1, name='N clonal segs')
-    model.setObjectiveN(-tcn_error_clonal, index=1, priority=1, weight=1-mcn_weight, name='TCN error')
-    model.setObjectiveN(-mcn_error_clonal, index=1, priority=1, weight=mcn_weight, name='MCN error')
+        model.addConstr(tcn_error_clonal == tcn_int_err.sum())
+        model.addConstr(mcn_error_clonal == mcn_int_err.sum())
 
+    else:
+        # objective 2a, 2b: minimize the combined error among CLONAL segments
+        # (err_term = err * allmatch, linearized with a tight big-M: the int
+        # errs are bounded by 0.5 since tcn_int/mcn_int sit within 0.5 of tcn/mcn)
+        M_tcn = max(delta_tcn_to_int, 0.5)
+        M_mcn = max(delta_mcn_to_int, 0.5)
+        tcn_int_err_term = model.addMVar(shape, vtype=GRB.CONTINUOUS, name="tcn_int_err_term")
+        mcn_int_err_term = model.addMVar(shape, vtype=GRB.CONTINUOUS, name="mcn_int_err_term")
+        model.addConstr(tcn_int_err_term <= M_tcn*allmatch)
+        model.addConstr(tcn_int_err_term >= tcn_int_err - M_tcn*(1 - allmatch))
+        model.addConstr(mcn_int_err_term <= M_mcn*allmatch)
+        model.addConstr(mcn_int_err_term >= mcn_int_err - M_mcn*(1 - allmatch))
+        model.addConstr(tcn_error_clonal == tcn_int_err_term.sum())
+        model.addConstr(mcn_error_clonal == mcn_int_err_term.sum())
+
+    ## seed the first solve with the grid-search heuristic: per-sample
+    ## (ploidy, 1/purity) minimizing the total rounding error, plus the CN
+    ## values they imply (Gurobi completes the remaining start values)
+    pl0, z0 = grid_start(n1_coef_pl, n1_coef_z, n1_const,
+                         mcn_coef_pl, mcn_coef_z, mcn_const, has_baf,
+                         min_ploidy, max_ploidy, z_min, z_max)
+    ## only the (pl, z) pair and the implied integer copy numbers are seeded;
+    ## the continuous families follow from the equality constraints, so Gurobi
+    ## fills them in when completing the partial start
+    mcn_start = mcn_coef_pl*pl0[:, None] + mcn_coef_z*z0[:, None] + mcn_const
+    tcn_start = ((n1_coef_pl + mcn_coef_pl)*pl0[:, None]
+                 + (n1_coef_z + mcn_coef_z)*z0[:, None] + n1_const + mcn_const)
+    pl.Start = pl0
+    z.Start = z0
+    tcn_int.Start = np.clip(np.round(tcn_start), 0.0, np.ceil(tcn_ub)+1)
+    mcn_int.Start = np.where(has_baf, np.clip(np.round(mcn_start), 0.0, np.ceil(mcn_ub)+1), 0.0)
+
+    # Solve the hierarchy as two sequential single-objective solves so the
+    # second level inherits the first incumbent as a MIP start instead of
+    # restarting cold (each solve has its own stagnation callback)
     model.ModelSense = GRB.MAXIMIZE
-    model.update()    
-    model.optimize(callback)
-    
+    model.setObjective(n_clonal)
+    model.update()
+    model.optimize(StagnationCallback(timeout, 'objective 1 (N clonal segs)'))
+
+    # warm-start the second solve from the obj1 incumbent and pin obj1 at its
+    # best value, then re-solve for the combined TCN/MCN error objective; if
+    # the first solve found no incumbent (infeasible model, or terminated
+    # before a first feasible solution) there is nothing to pin or extract
+    if model.SolCount > 0:
+        all_vars = model.getVars()
+        model.setAttr('Start', all_vars, model.getAttr('X', all_vars))
+        model.addConstr(n_clonal >= round(n_clonal.X), name='c_obj1_optimal')
+        model.setObjective(-(1 - mcn_weight)*tcn_error_clonal - mcn_weight*mcn_error_clonal)
+        model.optimize(StagnationCallback(timeout, 'objective 2 (TCN/MCN error)'))
+    else:
+        print('No feasible solution found for objective 1 (model status '+str(model.Status)+'); returning empty output.')
+
     # Store objective expressions as model attributes for later evaluation
     model._obj1_expr = n_clonal
     model._obj2_expr = -(1 - mcn_weight) * tcn_error_clonal - mcn_weight * mcn_error_clonal
@@ -351,79 +491,49 @@ def CNAlign(dat, gurobi_license, min_ploidy, max_ploidy, min_purity, max_purity,
 
     n_objectives = 2
     solution_count = model.SolCount
-    
-    # extract objective values for each solution
+
+    # output row labels built from the sample/segment names
+    pl_data = { "Variable": ['pl['+str(t)+']' for t in Samples] }
+    pu_data = { "Variable": ['z['+str(t)+']' for t in Samples] }
+    allmatch_data = { "Variable": ['allmatch['+str(s)+']' for s in Segments] }
+    tcn_data = { "Variable": ['tcn['+str(t)+','+str(s)+']' for t in Samples for s in Segments] }
+    mcn_data = { "Variable": ['mcn['+str(t)+','+str(s)+']' for t in Samples for s in Segments] }
+
+    # extract objectives and all variable families per solution, reading .Xn
+    # straight off the MVars still in scope (no getVars()/VarName scans) and
+    # switching the solution-pool entry once per solution
     obj1_vals = []
     obj2_vals = []
-    for i in range(model.SolCount):
+    for i in range(solution_count):
         model.params.SolutionNumber = i
-        obj1_vals.append(model._obj1_expr.Xn)
-        obj2_vals.append(
-            -(1 - mcn_weight) * model.getVarByName('tcn_error_clonal').Xn
-            - mcn_weight * model.getVarByName('mcn_error_clonal').Xn
-        )
+        sol = f"Solution_{i+1}"
+        obj1_vals.append(n_clonal.Xn)
+        obj2_vals.append(-(1 - mcn_weight)*tcn_error_clonal.Xn - mcn_weight*mcn_error_clonal.Xn)
+        pl_data[sol] = pl.Xn.tolist()
+        pu_data[sol] = (1/z.Xn).tolist()
+        allmatch_data[sol] = allmatch.Xn.tolist()
+        tcn_data[sol] = tcn.Xn.flatten().tolist()
+        mcn_data[sol] = mcn.Xn.flatten().tolist()
 
     df = pd.DataFrame({
         'Obj1': obj1_vals,
         'Obj2': obj2_vals
-        }, index=[f"Solution_{i+1}" for i in range(model.SolCount)])
+        }, index=[f"Solution_{i+1}" for i in range(solution_count)])
     obj_df = df.T.reset_index()
-    obj_df.columns = ['Variable'] + [f"Solution_{i+1}" for i in range(model.SolCount)]
-
-    # extract ploidy for each solution
-    pl_vars = [v for v in model.getVars() if v.VarName.startswith("pl[")]
-    pl_var_names = [v.VarName for v in pl_vars]
-    pl_data = { "Variable": pl_var_names }
-    for i in range(solution_count):
-        model.params.SolutionNumber = i
-        pl_data[f"Solution_{i+1}"] = [v.Xn for v in pl_vars]
-    
-    pl_df = pd.DataFrame(pl_data) 
+    obj_df.columns = ['Variable'] + [f"Solution_{i+1}" for i in range(solution_count)]
 
-    # extract purity for each solution
-    pu_vars = [v for v in model.getVars() if v.VarName.startswith("z[")]
-    pu_var_names = [v.VarName for v in pu_vars]
-    pu_data = { "Variable": pu_var_names }
-    for i in range(solution_count):
-        model.params.SolutionNumber = i
-        pu_data[f"Solution_{i+1}"] = [1/v.Xn for v in pu_vars]
-    
+    pl_df = pd.DataFrame(pl_data)
     pu_df = pd.DataFrame(pu_data)
-    pu_df.Variable = pu_df.Variable.replace('z\\[','pu[',regex=True) 
-
-    # extract allmatch for each solution
-    allmatch_vars = [v for v in model.getVars() if v.VarName.startswith("allmatch[")]
-    allmatch_var_names = [v.VarName for v in allmatch_vars]
-    allmatch_data = { "Variable": allmatch_var_names }
-    for i in range(solution_count):
-        model.params.SolutionNumber = i
-        allmatch_data[f"Solution_{i+1}"] = [v.Xn for v in allmatch_vars]
-    
+    pu_df.Variable = pu_df.Variable.replace('z\\[','pu[',regex=True)
     allmatch_df = pd.DataFrame(allmatch_data)
-
-    # extract tcn for each solution
-    tcn_vars = [v for v in model.getVars() if v.VarName.startswith("tcn[")]
-    tcn_var_names = [v.VarName for v in tcn_vars]
-    tcn_data = { "Variable": tcn_var_names }
-    for i in range(solution_count):
-        model.params.SolutionNumber = i
-        tcn_data[f"Solution_{i+1}"] = [v.Xn for v in tcn_vars]
-    
     tcn_df = pd.DataFrame(tcn_data)
-
-    # extract mcn for each solution
-    mcn_vars = [v for v in model.getVars() if v.VarName.startswith("mcn[")]
-    mcn_var_names = [v.VarName for v in mcn_vars]
-    mcn_data = { "Variable": mcn_var_names }
-    for i in range(solution_count):
-        model.params.SolutionNumber = i
-        mcn_data[f"Solution_{i+1}"] = [v.Xn for v in mcn_vars]
-    
     mcn_df = pd.DataFrame(mcn_data)
 
     # merge everything into a data.frame
     out = pd.concat([obj_df, pl_df, pu_df, allmatch_df, tcn_df, mcn_df], axis=0, ignore_index=True)
-    out.iloc[:, 1:] = out.iloc[:, 1:].round(6)
+    # round the solution columns in one NumPy call, skipping the string
+    # 'Variable' column so pandas doesn't re-infer dtypes per element
+    out.iloc[:, 1:] = np.round(out.iloc[:, 1:].to_numpy(dtype=np.float64), 6)
     return out
 
 
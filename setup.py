@@ -10,6 +10,7 @@ setup(
         install_requires=[
             'pandas',
             'numpy',
+            'scipy',
             'gurobipy>=12.0.0',
             ],
         entry_points={